@@ -34,6 +34,9 @@ from manim import *
 import numpy as np
 import os
 
+from deck import FLASHCARDS
+from waveforms import BASE_FREQS, STEP, fm_wave_function, segment_samples
+
 # Configure para imagem estática 16:9 (ex: 1080p)
 config.frame_height = 9
 config.frame_width = 16
@@ -41,27 +44,70 @@ config.pixel_height = 1080
 config.pixel_width = 1920
 config.disable_caching = True
 
-# Dicionário com os dados de cada flashcard
-FLASHCARDS = {
-    1: {"code": [1, 5, 2, 3, 1, 4], "answer": "413251"},
-    2: {"code": [6, 1, 3, 4, 1, 6], "answer": "614316"},
-    3: {"code": [4, 3, 2, 5, 6, 1], "answer": "165234"},
-    4: {"code": [1, 3, 4, 2, 5, 3], "answer": "352431"},
-    5: {"code": [2, 6, 5, 4, 3, 1], "answer": "134562"},
-    6: {"code": [5, 2, 6, 1, 3, 4], "answer": "431625"},
-    7: {"code": [3, 4, 5, 6, 1, 2], "answer": "216543"},
-    8: {"code": [6, 5, 4, 1, 2, 3], "answer": "321456"},
-    9: {"code": [2, 1, 3, 6, 4, 5], "answer": "546312"},
-    10: {"code": [5, 4, 1, 3, 6, 2], "answer": "263145"},
-}
+# Estilos visuais das ondas para cada tipo de frequência
+# Tipo 1 (8.0 Hz) - linha sólida
+# Tipo 2 (6.0 Hz) - pontos pequenos
+# Tipo 3 (4.6 Hz) - traços médios
+# Tipo 4 (4.0 Hz) - linha sólida
+# Tipo 5 (3.0 Hz) - padrão complexo (traço-ponto-traço)
+# Tipo 6 (2.5 Hz) - linha sólida
+LINE_STYLES = [
+    {"stroke_width": 2},      # Tipo 1: linha sólida
+    {"stroke_width": 2},      # Tipo 2: pontos pequenos
+    {"stroke_width": 2},      # Tipo 3: traços médios
+    {"stroke_width": 2},      # Tipo 4: linha sólida
+    {"stroke_width": 2},      # Tipo 5: padrão complexo
+    {"stroke_width": 2}       # Tipo 6: linha sólida
+]
+DASH_PATTERNS = [
+    None,                     # Tipo 1: linha contínua
+    [0.1, 0.1],              # Tipo 2: pontos pequenos
+    [0.2, 0.2],              # Tipo 3: traços médios
+    None,                     # Tipo 4: linha contínua
+    [0.3, 0.2, 0.05, 0.2],   # Tipo 5: traço-ponto-traço
+    None                      # Tipo 6: linha contínua
+]
+
+
+def build_segment_plots(axes, code, smooth=True):
+    """
+    Cria os seis segmentos da onda do cartão com o estilo do tipo de onda de
+    cada segmento. Com smooth=False, cada segmento vira uma poligonal direto
+    das amostras em cache (mais barato, para miniaturas).
+    """
+    fm_wave = fm_wave_function(code)
+    origin = axes.c2p(0, 0)
+    x_unit = axes.c2p(1, 0) - origin
+    y_unit = axes.c2p(0, 1) - origin
+    segment_plots = VGroup()
+    for i, (x, y) in enumerate(segment_samples(code)): # i é o índice do segmento 0-5
+        # Os estilos são 0-indexados, os tipos de onda (em 'code') são 1-indexados
+        style_index_for_segment = code[i] - 1
+        if smooth:
+            segment_plot = axes.plot(
+                fm_wave,
+                x_range=[i, i+1, STEP],
+                color=BLACK,
+                **LINE_STYLES[style_index_for_segment] # Usa o estilo para o TIPO de onda no segmento
+            )
+        else:
+            segment_plot = VMobject(color=BLACK, **LINE_STYLES[style_index_for_segment])
+            segment_plot.set_points_as_corners(origin + np.outer(x, x_unit) + np.outer(y, y_unit))
+        if DASH_PATTERNS[style_index_for_segment] is not None: # Usa o estilo para o TIPO de onda no segmento
+            segment_plot.set_dash_pattern(DASH_PATTERNS[style_index_for_segment])
+        segment_plots.add(segment_plot)
+    return segment_plots
 
 class FlashcardLayout(Scene):
     """
     Gera o flashcard selecionado via FLASHCARD_NUMBER (1-10)
     """
+    # Número do flashcard; quando None, vem da variável FLASHCARD_NUMBER
+    flashcard_number = None
+
     def construct(self):
         # Seleciona o número do flashcard
-        number = int(os.environ.get("FLASHCARD_NUMBER", 1))
+        number = self.flashcard_number or int(os.environ.get("FLASHCARD_NUMBER", 1))
         data = FLASHCARDS[number]
         code = data["code"]
         answer = data["answer"]
@@ -123,99 +169,8 @@ class FlashcardLayout(Scene):
             for i in np.arange(-1.5, 1.6, 0.5)
         ])
 
-        # Estilos visuais das ondas para cada tipo de frequência
-        # Tipo 1 (8.0 Hz) - linha sólida
-        # Tipo 2 (6.0 Hz) - pontos pequenos
-        # Tipo 3 (4.6 Hz) - traços médios
-        # Tipo 4 (4.0 Hz) - linha sólida
-        # Tipo 5 (3.0 Hz) - padrão complexo (traço-ponto-traço)
-        # Tipo 6 (2.5 Hz) - linha sólida
-        line_styles = [
-            {"stroke_width": 2},      # Tipo 1: linha sólida
-            {"stroke_width": 2},      # Tipo 2: pontos pequenos
-            {"stroke_width": 2},      # Tipo 3: traços médios
-            {"stroke_width": 2},      # Tipo 4: linha sólida
-            {"stroke_width": 2},      # Tipo 5: padrão complexo
-            {"stroke_width": 2}       # Tipo 6: linha sólida
-        ]
-        dash_patterns = [
-            None,                     # Tipo 1: linha contínua
-            [0.1, 0.1],              # Tipo 2: pontos pequenos
-            [0.2, 0.2],              # Tipo 3: traços médios
-            None,                     # Tipo 4: linha contínua
-            [0.3, 0.2, 0.05, 0.2],   # Tipo 5: traço-ponto-traço
-            None                      # Tipo 6: linha contínua
-        ]
-
-        # Frequências base para cada tipo de onda (em Hz)
-        # Organizadas por frequência decrescente para melhor visualização
-        base_freqs = {
-            1: 8.0,   # Frequência mais alta
-            2: 6.0,   
-            3: 4.6,   
-            4: 4.0,   
-            5: 3.0,   
-            6: 2.5    # Frequência mais baixa
-        }
-        frequencies = [base_freqs[d] for d in code]
-
-        # Função para transição suave
-        def smooth_transition(x, freq1, freq2, transition_point, width=0.1):
-            sigmoid = 1 / (1 + np.exp(-(x - transition_point) / width))
-            return freq1 * (1 - sigmoid) + freq2 * sigmoid
-
-        # Frequência instantânea
-        def frequency_at_x(x):
-            segment = int(x)
-            if segment >= 6:
-                return frequencies[5]
-            elif segment < 0:
-                return frequencies[0]
-            if segment == 5:
-                return frequencies[5]
-            transition_width = 0.05
-            if x % 1 > 1 - transition_width:
-                return smooth_transition(
-                    x,
-                    frequencies[segment],
-                    frequencies[segment+1],
-                    segment + 1 - transition_width/2,
-                    transition_width
-                )
-            return frequencies[segment]
-
-        # Fase integrando frequência
-        def phase_at_x(x, step=0.01):
-            points = np.arange(0, x+step, step)
-            phases = [0]
-            for i in range(1, len(points)):
-                dx = points[i] - points[i-1]
-                f1 = frequency_at_x(points[i-1]) * PI
-                f2 = frequency_at_x(points[i]) * PI
-                phases.append(phases[-1] + (f1 + f2) / 2 * dx)
-            return phases[-1]
-
-        # Valor da onda
-        def fm_wave(x):
-            return np.sin(phase_at_x(x))
-
         # Segmentos da onda
-        segment_plots = VGroup()
-        for i in range(6): # i é o índice do segmento 0-5
-            # Determina o estilo para este segmento com base no tipo de onda em 'code'
-            wave_type_in_segment = code[i]  # 'code' contém os tipos de onda (1-6)
-            # Os estilos são 0-indexados, os tipos de onda são 1-indexados
-            style_index_for_segment = wave_type_in_segment - 1 
-
-            segment_plot = axes.plot(
-                fm_wave,
-                x_range=[i, i+1, 0.01],
-                color=BLACK,
-                **line_styles[style_index_for_segment] # Usa o estilo para o TIPO de onda no segmento
-            )
-            if dash_patterns[style_index_for_segment] is not None: # Usa o estilo para o TIPO de onda no segmento
-                segment_plot.set_dash_pattern(dash_patterns[style_index_for_segment])
-            segment_plots.add(segment_plot)
+        segment_plots = build_segment_plots(axes, code)
 
         # --- Início das Modificações para a Cheat Sheet ---
 
@@ -263,7 +218,7 @@ class FlashcardLayout(Scene):
             number.move_to(bg.get_top() + DOWN * 0.3)
 
             # Valor da frequência base
-            current_mini_freq_val = base_freqs[cheat_wave_type] 
+            current_mini_freq_val = BASE_FREQS[cheat_wave_type] 
             freq_text = Text(f"{current_mini_freq_val:.1f} Hz", font_size=14, color=BLACK)
             freq_text.move_to(bg.get_bottom() + UP * 0.2)
             
@@ -294,9 +249,9 @@ class FlashcardLayout(Scene):
                 mini_wave.set_points_as_corners(wave_points_mini)
             
             # Aplica estilo visual da onda
-            mini_wave.set_stroke(width=line_styles[style_index_for_cheat_item]["stroke_width"], color=BLACK)
-            if dash_patterns[style_index_for_cheat_item] is not None:
-                mini_wave.set_dash_pattern(dash_patterns[style_index_for_cheat_item])
+            mini_wave.set_stroke(width=LINE_STYLES[style_index_for_cheat_item]["stroke_width"], color=BLACK)
+            if DASH_PATTERNS[style_index_for_cheat_item] is not None:
+                mini_wave.set_dash_pattern(DASH_PATTERNS[style_index_for_cheat_item])
             
             # Adiciona todos os elementos à entrada
             entry.add(bg, number, mini_wave, freq_text)
@@ -322,6 +277,10 @@ class FlashcardLayout(Scene):
         answer_text.to_edge(UR, buff=0.25)
         self.add(answer_text)
 
+        # Partes que mudam de um cartão para outro; o resto é o layout fixo
+        self.card_mobjects = [title, segment_plots, answer_text]
+        self.axes = axes
+
         # Borda do cartão
         frame_rect = Rectangle(
             width=config.frame_width * 0.98,
@@ -330,3 +289,29 @@ class FlashcardLayout(Scene):
             stroke_width=0.5
         )
         self.add(frame_rect)
+
+
+def build_flashcard_scene(number):
+    """
+    Constrói (sem renderizar) a cena do flashcard `number`. Deve ser chamada
+    dentro de um `tempconfig` com dry_run, para não criar arquivos de mídia.
+    """
+    scene = FlashcardLayout()
+    scene.flashcard_number = number
+    scene.setup()
+    scene.construct()
+    return scene
+
+
+def render_flashcard(number, **config_overrides):
+    """
+    Renderiza o flashcard `number` em memória e devolve a imagem (PIL, RGBA).
+
+    Nada é gravado em disco: a cena é construída e o quadro final é lido
+    direto da câmera. `config_overrides` é repassado ao `tempconfig` (ex.:
+    pixel_width/pixel_height para outras resoluções).
+    """
+    with tempconfig({"dry_run": True, **config_overrides}):
+        scene = build_flashcard_scene(number)
+        scene.renderer.update_frame(scene, ignore_skipping=True)
+        return scene.renderer.camera.get_image()
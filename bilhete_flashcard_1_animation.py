@@ -2,10 +2,18 @@ from manim import (
     Scene, Text, Rectangle, Axes, VGroup, Line, VMobject,
     WHITE, BLACK, GREY_A, GREY_C, GREY_D,
     UP, DOWN, RIGHT, UL, UR,
-    Create, linear, PI
+    Create, Succession, Wait, linear, PI
 )
-from manim import config
+from manim import config, tempconfig
+from functools import partial
 import numpy as np
+import os
+import shutil
+import tempfile
+
+from deck import FLASHCARDS
+from flashcard_camera import ClipReveal, FlashcardCamera
+from waveforms import BASE_FREQS, fm_wave_function
 
 # Configure for 16:9 video
 config.frame_height = 9
@@ -15,28 +23,34 @@ config.pixel_width = 1920
 config.output_file = "bilhete_flashcard_1_animation"
 config.disable_caching = True
 
-# Dicionário com os dados de cada flashcard (usando o mesmo do bilhete_flashcard.py)
-FLASHCARDS = {
-    1: {"code": [1, 5, 2, 3, 1, 4], "answer": "413251"},
-    2: {"code": [6, 1, 3, 4, 1, 6], "answer": "614316"},
-    3: {"code": [4, 3, 2, 5, 6, 1], "answer": "165234"},
-    4: {"code": [1, 3, 4, 2, 5, 3], "answer": "352431"},
-    5: {"code": [2, 6, 5, 4, 3, 1], "answer": "134562"},
-    6: {"code": [5, 2, 6, 1, 3, 4], "answer": "431625"},
-    7: {"code": [3, 4, 5, 6, 1, 2], "answer": "216543"},
-    8: {"code": [6, 5, 4, 1, 2, 3], "answer": "321456"},
-    9: {"code": [2, 1, 3, 6, 4, 5], "answer": "546312"},
-    10: {"code": [5, 4, 1, 3, 6, 2], "answer": "263145"},
-}
+# FLASHCARD_MINI_WAVE_CACHE=1 pré-renderiza um período de cada mini-onda da
+# cheat sheet e copia os pixels em cache a cada quadro, em vez de redesenhá-las
+MINI_WAVE_CACHE = os.environ.get("FLASHCARD_MINI_WAVE_CACHE", "0") == "1"
+# FLASHCARD_DIRTY_REGIONS=1 restaura a cada quadro só as regiões do fundo
+# estático onde algo se moveu, em vez de recopiar a imagem inteira
+DIRTY_REGIONS = os.environ.get("FLASHCARD_DIRTY_REGIONS", "0") == "1"
+# FLASHCARD_CLIP_REVEAL=1 revela os segmentos com um retângulo de recorte em
+# vez de Create, sem recalcular curvas parciais a cada quadro (a ponta da
+# linha em movimento fica cortada reta)
+CLIP_REVEAL = os.environ.get("FLASHCARD_CLIP_REVEAL", "0") == "1"
 
 class FlashcardAnimation(Scene):
     """
-    Animação do flashcard 1, com código 152314 (usando lógica e estilos do bilhete_flashcard.py)
+    Animação do flashcard selecionado via FLASHCARD_NUMBER (padrão: 1), usando
+    lógica e estilos do bilhete_flashcard.py
     """
+    # Número do flashcard; quando None, vem da variável FLASHCARD_NUMBER
+    flashcard_number = None
+
+    def __init__(self, **kwargs):
+        super().__init__(camera_class=FlashcardCamera, **kwargs)
+
     def construct(self):
         self.camera.background_color = WHITE
+        self.camera.track_dirty_regions = DIRTY_REGIONS
+        card_number = self.flashcard_number or int(os.environ.get("FLASHCARD_NUMBER", 1))
         # Título
-        title = Text("Bilhete 1/4", font_size=48, color=BLACK)
+        title = Text(str(card_number), font_size=48, color=BLACK)
         title.to_edge(UL, buff=0.5)
         # Dimensões do cartão
         axes_width = config.frame_width * 0.85
@@ -105,53 +119,11 @@ class FlashcardAnimation(Scene):
             None                      # Tipo 6: linha contínua
         ]
         # Frequências base para cada tipo de onda (em Hz)
-        base_freqs = {
-            1: 8.0,   # Frequência mais alta
-            2: 6.0,   
-            3: 4.6,   
-            4: 4.0,   
-            5: 3.0,   
-            6: 2.5    # Frequência mais baixa
-        }
-        # Código do flashcard 1
-        code = FLASHCARDS[1]["code"]
-        frequencies = [base_freqs[d] for d in code]
-        # Função para transição suave
-        def smooth_transition(x, freq1, freq2, transition_point, width=0.1):
-            sigmoid = 1 / (1 + np.exp(-(x - transition_point) / width))
-            return freq1 * (1 - sigmoid) + freq2 * sigmoid
-        # Frequência instantânea
-        def frequency_at_x(x):
-            segment = int(x)
-            if segment >= 6:
-                return frequencies[5]
-            elif segment < 0:
-                return frequencies[0]
-            if segment == 5:
-                return frequencies[5]
-            transition_width = 0.05
-            if x % 1 > 1 - transition_width:
-                return smooth_transition(
-                    x,
-                    frequencies[segment],
-                    frequencies[segment+1],
-                    segment + 1 - transition_width/2,
-                    transition_width
-                )
-            return frequencies[segment]
-        # Fase integrando frequência
-        def phase_at_x(x, step=0.01):
-            points = np.arange(0, x+step, step)
-            phases = [0]
-            for i in range(1, len(points)):
-                dx = points[i] - points[i-1]
-                f1 = frequency_at_x(points[i-1]) * PI
-                f2 = frequency_at_x(points[i]) * PI
-                phases.append(phases[-1] + (f1 + f2) / 2 * dx)
-            return phases[-1]
-        # Valor da onda
-        def fm_wave(x):
-            return np.sin(phase_at_x(x))
+        base_freqs = BASE_FREQS
+        # Código do flashcard
+        code = FLASHCARDS[card_number]["code"]
+        # Valor da onda (fase integrando a frequência, ver waveforms.py)
+        fm_wave = fm_wave_function(code)
         # Segmentos da onda
         segment_plots = []
         for i in range(6):
@@ -215,11 +187,21 @@ class FlashcardAnimation(Scene):
             mini_wave.set_stroke(width=line_styles[style_index_for_cheat_item]["stroke_width"], color=BLACK)
             if dash_patterns[style_index_for_cheat_item] is not None:
                 mini_wave.set_dash_pattern(dash_patterns[style_index_for_cheat_item])
-            entry.add(bg, number, mini_wave, freq_text)
+            # A mini-onda fica fora da entrada: as caixas são estáticas e entram
+            # na imagem de fundo que o Manim guarda durante o self.play
+            entry.add(bg, number, freq_text)
             cheat_sheet_entries.add(entry)
             mini_waves.add(mini_wave)
             current_x_position += new_bg_width + gap_between_items
         # Animação das mini-ondas (opcional, pode ser removida se não quiser animar)
+        def mini_wave_points(x_min, x_max, y_center, freq, t):
+            points = np.linspace(0, 1, 100)
+            wave_points = []
+            for p in points:
+                x = x_min + p * (x_max - x_min)
+                y = y_center + 0.3 * np.sin(freq * PI * p + t * freq)
+                wave_points.append([x, y, 0])
+            return wave_points
         def create_wave_animation(wave_mob, freq):
             def wave_updater(mob):
                 t = self.renderer.time * 2
@@ -229,32 +211,88 @@ class FlashcardAnimation(Scene):
                 x_min = min(p[0] for p in original_points)
                 x_max = max(p[0] for p in original_points)
                 y_center = mob.get_center()[1]
-                points = np.linspace(0, 1, 100)
-                wave_points = []
-                for p in points:
-                    x = x_min + p * (x_max - x_min)
-                    y = y_center + 0.3 * np.sin(freq * PI * p + t * freq)
-                    wave_points.append([x, y, 0])
-                mob.set_points_as_corners(wave_points)
+                mob.set_points_as_corners(mini_wave_points(x_min, x_max, y_center, freq, t))
             return wave_updater
+        # Versão em cache: cada mini-onda se repete a cada PI/freq segundos (a
+        # fase avança 2*freq rad/s). O período comum das seis (10*PI s, por
+        # causa de 4.6 Hz e 2.5 Hz) é maior que a animação inteira, então o
+        # cache é feito por caixa: um bloco de pixels por quadro de um período,
+        # e o updater só escolhe qual bloco a câmera deve copiar.
+        def cache_wave_animation(wave_mob, entry, freq):
+            original_points = wave_mob.get_points_defining_boundary()
+            x_min = original_points[:, 0].min()
+            x_max = original_points[:, 0].max()
+            y_center = wave_mob.get_center()[1]
+            stroke_pad = int(np.ceil(
+                wave_mob.get_stroke_width() * self.camera.cairo_line_width_multiple
+                * self.camera.pixel_width / self.camera.frame_width
+            )) + 2
+            rect = self.camera.pixel_rect(
+                [[x_min, y_center - 0.3, 0], [x_max, y_center + 0.3, 0]],
+                pad=stroke_pad,
+            )
+            n_tiles = max(1, int(np.ceil(PI / freq * config.frame_rate)))
+            tiles = []
+            for k in range(n_tiles):
+                t = 2 * PI * k / (n_tiles * freq)
+                wave_mob.set_points_as_corners(mini_wave_points(x_min, x_max, y_center, freq, t))
+                tiles.append(self.camera.render_tile([entry, wave_mob], rect))
+            self.camera.cache_periodic_mobject(wave_mob, rect, tiles)
+            def tile_updater(mob):
+                phase = (self.renderer.time * 2 * freq) % (2 * PI)
+                mob.tile_index = int(round(phase / (2 * PI) * n_tiles)) % n_tiles
+            return tile_updater
         # Adiciona elementos à cena
         self.add(title)
         self.add(axes)
         self.add(x_lines, y_lines)
         self.add(cheat_sheet_entries)
         self.add(frame_rect)
+        # Por último os mobjects que se movem: o Manim trata como estático tudo
+        # o que vem antes do primeiro mobject com updater
+        self.add(mini_waves)
         # Aplica updaters nas mini-ondas
         for i, wave in enumerate(mini_waves):
             freq = base_freqs[cheat_sheet_wave_types_ordered[i]]
-            wave.add_updater(create_wave_animation(wave, freq))
+            if MINI_WAVE_CACHE:
+                wave.add_updater(cache_wave_animation(wave, cheat_sheet_entries[i], freq))
+            else:
+                wave.add_updater(create_wave_animation(wave, freq))
         # Animação dos segmentos da onda principal
+        # Os seis segmentos e a pausa final vão num único self.play: o Manim
+        # grava um só arquivo parcial, sem reabrir o encoder a cada segmento
+        # nem concatenar os pedaços no final.
         segment_time = 5/6
-        for i, segment in enumerate(segment_plots):
-            self.play(
-                Create(segment),
-                run_time=segment_time,
-                rate_func=linear
+        reveal = partial(ClipReveal, camera=self.camera) if CLIP_REVEAL else Create
+        self.play(
+            Succession(
+                *[
+                    reveal(segment, run_time=segment_time, rate_func=linear)
+                    for segment in segment_plots
+                ],
+                Wait(run_time=5),
             )
-        self.wait(5)
+        )
         for wave in mini_waves:
-            wave.clear_updaters()
\ No newline at end of file
+            wave.clear_updaters()
+
+
+def render_flashcard_animation(number, output_path):
+    """
+    Renderiza a animação do flashcard `number` em `output_path` (mp4).
+
+    Cada chamada usa uma pasta de mídia temporária própria, para que vários
+    processos possam renderizar ao mesmo tempo sem disputar os arquivos
+    parciais do Manim.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    media_dir = tempfile.mkdtemp(prefix="media_", dir=output_dir)
+    try:
+        with tempconfig({"media_dir": media_dir, "output_file": f"bilhete_flashcard_{number}_animation"}):
+            scene = FlashcardAnimation()
+            scene.flashcard_number = number
+            scene.render()
+            shutil.move(str(scene.renderer.file_writer.movie_file_path), output_path)
+    finally:
+        shutil.rmtree(media_dir, ignore_errors=True)
+    return output_path
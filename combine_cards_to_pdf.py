@@ -1,8 +1,14 @@
+import argparse
 import os
+import tempfile
+from multiprocessing import Pool
 from PIL import Image
 from reportlab.lib.pagesizes import landscape, A4
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
+from deck_shards import merge_manifests
+
 # Configurações
 IMAGES_DIR = "manimations/media/images/bilhete_flashcard/"  # caminho corrigido
 OUTPUT_PDF = "bilhetes_flashcards.pdf"
@@ -36,31 +42,109 @@ def get_image_files(directory):
     files.sort(key=extract_number)
     return [os.path.join(directory, f) for f in files]
 
+def draw_page(c, batch):
+    """
+    Desenha um lote de até IMAGES_PER_PAGE cartões na página atual do canvas,
+    nas posições de POSITIONS. Cada cartão pode ser um caminho de arquivo ou
+    uma imagem PIL já em memória.
+    """
+    for idx, card in enumerate(batch):
+        x, y = POSITIONS[idx]
+        if isinstance(card, Image.Image) or card.lower().endswith('.png'):
+            source = ImageReader(card) if isinstance(card, Image.Image) else card
+            # O ReportLab redimensiona a imagem para caber no espaço do cartão
+            c.drawImage(source, x, y, width=CARD_WIDTH, height=CARD_HEIGHT, preserveAspectRatio=True, anchor='c')
+        else:
+            # Outros formatos são decodificados pelo PIL, sem arquivo temporário
+            # (vários processos podem montar páginas ao mesmo tempo)
+            with Image.open(card) as image:
+                c.drawImage(ImageReader(image), x, y, width=CARD_WIDTH, height=CARD_HEIGHT, preserveAspectRatio=True, anchor='c')
+    c.showPage()
+
+def write_pdf(cards, output_pdf):
+    """
+    Monta o PDF a partir de um iterável de cartões (caminhos ou imagens PIL),
+    na ordem recebida. Cada página é emitida assim que seus IMAGES_PER_PAGE
+    cartões chegam, então `cards` pode ser um gerador que ainda está
+    renderizando. As páginas prontas ficam no canvas até o `save()`. Devolve
+    o número de cartões escritos.
+    """
+    c = canvas.Canvas(output_pdf, pagesize=landscape(A4))
+    batch = []
+    count = 0
+    for card in cards:
+        batch.append(card)
+        count += 1
+        if len(batch) == IMAGES_PER_PAGE:
+            draw_page(c, batch)
+            batch = []
+    if batch:
+        draw_page(c, batch)
+    if count:
+        c.save()
+    return count
+
+def _write_part(args):
+    cards, part_pdf = args
+    write_pdf(cards, part_pdf)
+    return part_pdf
+
+def write_pdf_parallel(cards, output_pdf, workers):
+    """
+    Como `write_pdf`, mas divide as páginas em blocos contíguos, cada bloco
+    vira um PDF parcial em um processo separado e as partes são juntadas no
+    final sem recodificar as imagens. `cards` deve ser uma lista de caminhos.
+    """
+    # Requer o pypdf (pip install pypdf) apenas neste modo
+    from pypdf import PdfWriter
+
+    if not cards:
+        return 0
+    n_pages = -(-len(cards) // IMAGES_PER_PAGE)
+    # Alguns blocos por processo para equilibrar a carga entre eles
+    n_parts = max(1, min(n_pages, workers * 4))
+    pages_per_part = -(-n_pages // n_parts)
+    cards_per_part = pages_per_part * IMAGES_PER_PAGE
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_pdf))) as tmp_dir:
+        jobs = [
+            (cards[i:i + cards_per_part], os.path.join(tmp_dir, f"parte_{i // cards_per_part:05d}.pdf"))
+            for i in range(0, len(cards), cards_per_part)
+        ]
+        with Pool(workers) as pool:
+            parts = pool.map(_write_part, jobs)
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(part)
+        with open(output_pdf, "wb") as f:
+            writer.write(f)
+    return len(cards)
+
 def main():
-    image_files = get_image_files(IMAGES_DIR)
+    parser = argparse.ArgumentParser(description="Junta os cartões renderizados em um PDF de impressão.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos gerando partes do PDF em paralelo (requer pypdf se > 1)")
+    parser.add_argument("--manifests", nargs="+", default=None,
+                        help="manifestos dos shards do render_deck.py; substituem a busca em IMAGES_DIR")
+    args = parser.parse_args()
+
+    if args.manifests:
+        try:
+            scene, image_files = merge_manifests(args.manifests)
+        except ValueError as e:
+            parser.exit(1, f"{e}\n")
+        if scene != "layout":
+            parser.exit(1, f"manifestos da cena '{scene}' não geram PDF (só 'layout')\n")
+    else:
+        image_files = get_image_files(IMAGES_DIR)
     if not image_files:
         print("Nenhuma imagem encontrada.")
         return
 
-    c = canvas.Canvas(OUTPUT_PDF, pagesize=landscape(A4))
-
-    for i in range(0, len(image_files), IMAGES_PER_PAGE):
-        batch = image_files[i:i+IMAGES_PER_PAGE]
-        for idx, img_path in enumerate(batch):
-            img = Image.open(img_path)
-            # Garante que a imagem está em PNG temporário (ReportLab lida melhor com PNG)
-            if img_path.lower().endswith('.png'):
-                temp_path = img_path
-            else:
-                temp_path = f"_temp_{idx}.png"
-                img.save(temp_path)
-            x, y = POSITIONS[idx]
-            # O ReportLab redimensiona a imagem para caber no espaço do cartão
-            c.drawImage(temp_path, x, y, width=CARD_WIDTH, height=CARD_HEIGHT, preserveAspectRatio=True, anchor='c')
-            if not img_path.lower().endswith('.png'):
-                os.remove(temp_path)
-        c.showPage()
-    c.save()
+    if args.workers > 1:
+        write_pdf_parallel(image_files, OUTPUT_PDF, args.workers)
+    else:
+        write_pdf(image_files, OUTPUT_PDF)
     print(f"PDF gerado: {OUTPUT_PDF}")
 
 if __name__ == "__main__":
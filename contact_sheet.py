@@ -0,0 +1,101 @@
+"""
+Folha de contato do baralho: miniaturas de todos os cartões em uma imagem.
+
+Tudo é feito em um único processo e em uma única passada. O layout fixo do
+cartão (eixos, grade, cheat sheet, borda) é construído e rasterizado uma vez;
+cada miniatura parte de uma cópia desses pixels e só desenha os seis
+segmentos da onda, a partir das amostras em cache de `waveforms.py`. O número
+e a resposta de cada cartão vão na legenda abaixo da miniatura (o título e a
+resposta dentro do cartão são omitidos, ilegíveis nesse tamanho). As linhas
+da folha são gravadas no PNG conforme ficam prontas.
+
+Uso (na raiz do repositório):
+
+    python contact_sheet.py --output folha_de_contato.png --columns 10
+"""
+
+import argparse
+
+import numpy as np
+from manim import Camera, tempconfig
+from PIL import Image, ImageDraw
+
+from bilhete_flashcard import build_flashcard_scene, build_segment_plots
+from deck import FLASHCARDS
+from render_poster import write_png_bands
+
+MARGIN = 8
+LABEL_HEIGHT = 16
+
+
+def iter_thumbnails(numbers, thumb_width):
+    """Gera (número, array RGB) da miniatura de cada cartão."""
+    with tempconfig({"dry_run": True}):
+        scene = build_flashcard_scene(numbers[0])
+        scene_camera = scene.renderer.camera
+        static = [m for m in scene.mobjects if m not in scene.card_mobjects]
+        camera = Camera(
+            pixel_width=thumb_width,
+            pixel_height=round(thumb_width * scene_camera.frame_height / scene_camera.frame_width),
+            frame_width=scene_camera.frame_width,
+            frame_height=scene_camera.frame_height,
+            background_color=scene_camera.background_color,
+        )
+        camera.capture_mobjects(static)
+        static_pixels = np.array(camera.pixel_array)
+        for number in numbers:
+            camera.set_frame_to_background(static_pixels)
+            camera.capture_mobjects(build_segment_plots(scene.axes, FLASHCARDS[number]["code"], smooth=False))
+            yield number, camera.pixel_array[:, :, :3].copy()
+
+
+def iter_sheet_rows(thumbnails, columns, thumb_width, thumb_height):
+    """Agrupa as miniaturas em linhas da folha, já com as legendas."""
+    cell_width = thumb_width + MARGIN
+    row_height = thumb_height + LABEL_HEIGHT + MARGIN
+    sheet_width = columns * cell_width + MARGIN
+    row = None
+    for i, (number, pixels) in enumerate(thumbnails):
+        column = i % columns
+        if column == 0:
+            if row is not None:
+                yield np.array(row)
+            row = Image.new("RGB", (sheet_width, row_height), "white")
+            draw = ImageDraw.Draw(row)
+        x = MARGIN + column * cell_width
+        row.paste(Image.fromarray(pixels), (x, MARGIN))
+        draw.text((x, MARGIN + thumb_height + 2), f"{number}: {FLASHCARDS[number]['answer']}", fill="black")
+    if row is not None:
+        yield np.array(row)
+
+
+def render_contact_sheet(numbers, output, thumb_width, columns):
+    """Gera a folha de contato dos cartões `numbers` em `output` (PNG)."""
+    thumb_height = round(thumb_width * 9 / 16)
+    n_rows = -(-len(numbers) // columns)
+    width = columns * (thumb_width + MARGIN) + MARGIN
+    height = n_rows * (thumb_height + LABEL_HEIGHT + MARGIN)
+    rows = iter_sheet_rows(iter_thumbnails(numbers, thumb_width), columns, thumb_width, thumb_height)
+    write_png_bands(output, width, height, rows, dpi=96)
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=None,
+                        help="números dos cartões (padrão: todo o baralho)")
+    parser.add_argument("--thumb-width", type=int, default=240, help="largura de cada miniatura em pixels")
+    parser.add_argument("--columns", type=int, default=10, help="miniaturas por linha")
+    parser.add_argument("--output", default="folha_de_contato.png", help="arquivo PNG de saída")
+    args = parser.parse_args()
+    numbers = args.cards or sorted(FLASHCARDS)
+    unknown = [n for n in numbers if n not in FLASHCARDS]
+    if unknown:
+        parser.error(f"cartões fora do baralho: {unknown}")
+
+    width, height = render_contact_sheet(numbers, args.output, args.thumb_width, args.columns)
+    print(f"Folha de contato gerada: {args.output} ({len(numbers)} cartões, {width}x{height} px)")
+
+
+if __name__ == "__main__":
+    main()
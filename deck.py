@@ -0,0 +1,21 @@
+"""
+Baralho de flashcards de FM.
+
+Cada cartão tem o código (sequência de seis tipos de onda, 1-6) e a resposta.
+Fica em um módulo próprio, sem depender do Manim, para que scripts como a
+montagem do PDF possam ler o baralho sem carregar o renderizador.
+"""
+
+# Dicionário com os dados de cada flashcard
+FLASHCARDS = {
+    1: {"code": [1, 5, 2, 3, 1, 4], "answer": "413251"},
+    2: {"code": [6, 1, 3, 4, 1, 6], "answer": "614316"},
+    3: {"code": [4, 3, 2, 5, 6, 1], "answer": "165234"},
+    4: {"code": [1, 3, 4, 2, 5, 3], "answer": "352431"},
+    5: {"code": [2, 6, 5, 4, 3, 1], "answer": "134562"},
+    6: {"code": [5, 2, 6, 1, 3, 4], "answer": "431625"},
+    7: {"code": [3, 4, 5, 6, 1, 2], "answer": "216543"},
+    8: {"code": [6, 5, 4, 1, 2, 3], "answer": "321456"},
+    9: {"code": [2, 1, 3, 6, 4, 5], "answer": "546312"},
+    10: {"code": [5, 4, 1, 3, 6, 2], "answer": "263145"},
+}
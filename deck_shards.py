@@ -0,0 +1,114 @@
+"""
+Divisão determinística do baralho em shards e manifestos de renderização.
+
+Cada cartão vai para o shard `crc32(id) % shard_count`; a atribuição depende
+só do id, então não muda quando outros cartões entram ou saem do baralho e
+pode ser recalculada em qualquer máquina. Cada shard grava um manifesto JSON
+com o arquivo e o hash SHA-256 de cada cartão, e `merge_manifests` confere
+que os manifestos de todos os shards estão completos antes da montagem final.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+
+from deck import FLASHCARDS
+
+
+def shard_of(card_id, shard_count):
+    """Shard (0 a shard_count - 1) do cartão `card_id`."""
+    return zlib.crc32(str(card_id).encode()) % shard_count
+
+
+def cards_for_shard(shard_index, shard_count, cards=None):
+    """Ids dos cartões do shard, em ordem crescente."""
+    cards = FLASHCARDS if cards is None else cards
+    return sorted(c for c in cards if shard_of(c, shard_count) == shard_index)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def manifest_path(out_dir, shard_index, shard_count):
+    return os.path.join(out_dir, f"manifest_{shard_index}_of_{shard_count}.json")
+
+
+def write_manifest(path, scene, shard_index, shard_count, entries):
+    """
+    Grava o manifesto de um shard. `entries` mapeia id do cartão ->
+    caminho do arquivo; os caminhos são guardados relativos ao manifesto.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    manifest = {
+        "scene": scene,
+        "shard_index": shard_index,
+        "shard_count": shard_count,
+        "cards": {
+            str(card_id): {
+                "file": os.path.relpath(os.path.abspath(file), base),
+                "sha256": file_sha256(file),
+            }
+            for card_id, file in sorted(entries.items())
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def merge_manifests(paths):
+    """
+    Confere os manifestos de todos os shards e devolve (cena, lista de
+    arquivos na ordem do baralho). Levanta ValueError listando os problemas
+    se faltar algum shard ou cartão, ou se algum arquivo estiver ausente ou
+    com hash diferente do registrado.
+    """
+    problems = []
+    manifests = []
+    for path in paths:
+        with open(path) as f:
+            manifests.append((path, json.load(f)))
+    if not manifests:
+        raise ValueError("nenhum manifesto informado")
+
+    scenes = {m["scene"] for _, m in manifests}
+    counts = {m["shard_count"] for _, m in manifests}
+    if len(scenes) > 1:
+        problems.append(f"manifestos de cenas diferentes: {sorted(scenes)}")
+    if len(counts) > 1:
+        problems.append(f"manifestos com shard_count diferentes: {sorted(counts)}")
+    shard_count = manifests[0][1]["shard_count"]
+
+    files = {}
+    seen_shards = set()
+    for path, manifest in manifests:
+        shard_index = manifest["shard_index"]
+        if shard_index in seen_shards:
+            problems.append(f"shard {shard_index} repetido ({path})")
+        seen_shards.add(shard_index)
+        expected = set(cards_for_shard(shard_index, shard_count))
+        present = {int(c) for c in manifest["cards"]}
+        for card_id in sorted(expected - present):
+            problems.append(f"shard {shard_index}: cartão {card_id} ausente")
+        for card_id in sorted(present - expected):
+            problems.append(f"shard {shard_index}: cartão {card_id} não pertence a este shard")
+        base = os.path.dirname(os.path.abspath(path))
+        for card_id, entry in manifest["cards"].items():
+            file = os.path.join(base, entry["file"])
+            if not os.path.exists(file):
+                problems.append(f"cartão {card_id}: arquivo {file} não encontrado")
+            elif file_sha256(file) != entry["sha256"]:
+                problems.append(f"cartão {card_id}: hash de {file} não confere")
+            else:
+                files[int(card_id)] = file
+    for shard_index in sorted(set(range(shard_count)) - seen_shards):
+        problems.append(f"manifesto do shard {shard_index} ausente")
+
+    if problems:
+        raise ValueError("manifestos incompletos:\n" + "\n".join(f"  - {p}" for p in problems))
+    return scenes.pop(), [files[c] for c in sorted(FLASHCARDS)]
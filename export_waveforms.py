@@ -0,0 +1,172 @@
+"""
+Exporta as amostras da onda de todos os cartões do baralho, sem o Manim.
+
+As amostras são as mesmas dos gráficos do cartão (seis segmentos, passo
+0.01, extremidades incluídas) e são calculadas em blocos de `--chunk-size`
+cartões, gravados conforme ficam prontos, então a memória usada não depende
+do tamanho do baralho.
+
+Formatos:
+
+- `npy` (padrão): uma pasta com uma coluna por arquivo .npy, que podem ser
+  abertas com memória mapeada. `WaveformStore` lê um cartão qualquer sem
+  carregar o resto:
+
+      card_id.npy   (cartões,)           ids em ordem crescente
+      code.npy      (cartões, 6)         tipos de onda de cada segmento
+      x.npy         (amostras,)          abscissas, iguais para todos os cartões
+      segment.npy   (amostras,)          índice do segmento (0-5) de cada amostra
+      y.npy         (cartões, amostras)  valores da onda
+
+- `parquet`: um arquivo em formato longo (uma linha por amostra: card_id,
+  code, x, y, segment), com um row group por bloco. Requer o pyarrow.
+
+Uso (na raiz do repositório):
+
+    python export_waveforms.py --output ondas
+    python export_waveforms.py --format parquet --output ondas.parquet
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from deck import FLASHCARDS
+from waveforms import BASE_FREQS, STEP, batch_segment_samples, sample_layout
+
+CHUNK_SIZE = 4096
+
+
+def iter_chunks(cards, chunk_size):
+    """Gera (ids, códigos, valores) de blocos de até `chunk_size` cartões."""
+    card_ids = sorted(cards)
+    for start in range(0, len(card_ids), chunk_size):
+        ids = np.array(card_ids[start:start + chunk_size], dtype=np.int64)
+        codes = np.array([cards[c]["code"] for c in ids], dtype=np.int8)
+        yield ids, codes, batch_segment_samples(codes)
+
+
+def _open_npy(path, dtype, shape):
+    """Abre um .npy para escrita sequencial: grava o cabeçalho e devolve o arquivo."""
+    f = open(path, "wb")
+    np.lib.format.write_array_header_2_0(f, {
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": shape,
+    })
+    return f
+
+
+def export_npy(cards, out_dir, chunk_size=CHUNK_SIZE):
+    """Exporta `cards` para a pasta `out_dir` no formato npy (ver módulo)."""
+    os.makedirs(out_dir, exist_ok=True)
+    x, segment = sample_layout()
+    n_cards = len(cards)
+    np.save(os.path.join(out_dir, "x.npy"), x)
+    np.save(os.path.join(out_dir, "segment.npy"), segment)
+    # Cada bloco é anexado ao fim dos arquivos assim que é calculado
+    outputs = [
+        _open_npy(os.path.join(out_dir, "card_id.npy"), np.int64, (n_cards,)),
+        _open_npy(os.path.join(out_dir, "code.npy"), np.int8, (n_cards, 6)),
+        _open_npy(os.path.join(out_dir, "y.npy"), np.float64, (n_cards, len(x))),
+    ]
+    try:
+        for chunk in iter_chunks(cards, chunk_size):
+            for f, array in zip(outputs, chunk):
+                f.write(np.ascontiguousarray(array).tobytes())
+    finally:
+        for f in outputs:
+            f.close()
+    with open(os.path.join(out_dir, "metadata.json"), "w") as f:
+        json.dump({"cards": n_cards, "samples_per_card": len(x), "step": STEP,
+                   "base_freqs": BASE_FREQS}, f, indent=2)
+
+
+def export_parquet(cards, path, chunk_size=CHUNK_SIZE):
+    """Exporta `cards` para um arquivo Parquet em formato longo (ver módulo)."""
+    # Requer o pyarrow (pip install pyarrow) apenas neste formato
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    x, segment = sample_layout()
+    schema = pa.schema([
+        ("card_id", pa.int64()),
+        ("code", pa.string()),
+        ("x", pa.float64()),
+        ("y", pa.float64()),
+        ("segment", pa.int8()),
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        for ids, codes, y in iter_chunks(cards, chunk_size):
+            code_strings = np.array(["".join(map(str, code)) for code in codes])
+            table = pa.table({
+                "card_id": np.repeat(ids, len(x)),
+                "code": np.repeat(code_strings, len(x)),
+                "x": np.tile(x, len(ids)),
+                "y": y.ravel(),
+                "segment": np.tile(segment, len(ids)),
+            }, schema=schema)
+            writer.write_table(table)
+
+
+class WaveformStore:
+    """
+    Leitura de uma exportação npy com memória mapeada: só as páginas do
+    cartão pedido são lidas do disco.
+
+        store = WaveformStore("ondas")
+        card = store.card(5)
+        card["x"], card["y"], card["segment"], card["code"]
+    """
+    def __init__(self, path):
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        self.card_ids = load("card_id")
+        self.codes = load("code")
+        self.x = load("x")
+        self.segment = load("segment")
+        self.y = load("y")
+
+    def __len__(self):
+        return len(self.card_ids)
+
+    def __contains__(self, card_id):
+        row = np.searchsorted(self.card_ids, card_id)
+        return row < len(self.card_ids) and self.card_ids[row] == card_id
+
+    def card(self, card_id):
+        """Amostras de um cartão; levanta KeyError se o id não existir."""
+        if card_id not in self:
+            raise KeyError(card_id)
+        row = np.searchsorted(self.card_ids, card_id)
+        return {
+            "card_id": int(card_id),
+            "code": np.array(self.codes[row]),
+            "x": np.array(self.x),
+            "y": np.array(self.y[row]),
+            "segment": np.array(self.segment),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=["npy", "parquet"], default="npy")
+    parser.add_argument("--output", default=None,
+                        help="pasta (npy) ou arquivo (parquet) de saída (padrão: ondas / ondas.parquet)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"cartões calculados por bloco (padrão: {CHUNK_SIZE})")
+    args = parser.parse_args()
+
+    if args.format == "npy":
+        output = args.output or "ondas"
+        export_npy(FLASHCARDS, output, args.chunk_size)
+    else:
+        output = args.output or "ondas.parquet"
+        export_parquet(FLASHCARDS, output, args.chunk_size)
+    print(f"Ondas exportadas: {output} ({len(FLASHCARDS)} cartões)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Câmera Cairo usada pelas animações e renderizações especiais dos flashcards.
+
+Acrescenta à câmera padrão do Manim:
+
+- um cache de quadros para mobjects periódicos: cada estado do mobject é
+  rasterizado uma única vez e, a cada quadro, o bloco de pixels
+  correspondente é copiado para a imagem final em vez de o mobject ser
+  redesenhado vetorialmente;
+- composição por regiões sujas: sobre o fundo estático que o Manim já guarda
+  durante um `self.play`, só os retângulos ocupados pelos mobjects em
+  movimento no quadro anterior são restaurados, em vez da imagem inteira;
+- recorte por retângulo para a animação `ClipReveal`, que revela um mobject
+  da esquerda para a direita sem recalcular curvas parciais a cada quadro.
+"""
+
+from manim import Animation, Camera, VMobject
+import numpy as np
+
+# Acima deste número de retângulos, restaurar um único retângulo envolvente
+# sai mais barato que fazer uma cópia por retângulo
+MAX_DIRTY_REGIONS = 64
+
+
+def render_region(mobjects, rect, frame_center, frame_width, frame_height,
+                  pixel_width, pixel_height, background_color, background_opacity=1):
+    """
+    Rasteriza `mobjects` só dentro de `rect` = (x0, y0, x1, y1), em pixels de
+    uma imagem virtual de `pixel_width` x `pixel_height` que enquadra a cena
+    como uma câmera com esses parâmetros faria. Só o bloco é alocado, e
+    blocos vizinhos se encaixam sem emendas porque seguem a mesma grade.
+    Devolve um array RGBA (y1 - y0, x1 - x0, 4).
+    """
+    x0, y0, x1, y1 = rect
+    units_per_pixel_x = frame_width / pixel_width
+    units_per_pixel_y = frame_height / pixel_height
+    center = np.array([
+        frame_center[0] + ((x0 + x1) / 2 - pixel_width / 2) * units_per_pixel_x,
+        frame_center[1] - ((y0 + y1) / 2 - pixel_height / 2) * units_per_pixel_y,
+        0,
+    ])
+    tile_camera = Camera(
+        frame_center=center,
+        frame_width=(x1 - x0) * units_per_pixel_x,
+        frame_height=(y1 - y0) * units_per_pixel_y,
+        pixel_width=x1 - x0,
+        pixel_height=y1 - y0,
+        background_color=background_color,
+        background_opacity=background_opacity,
+    )
+    tile_camera.capture_mobjects(mobjects)
+    return tile_camera.pixel_array
+
+
+class FlashcardCamera(Camera):
+    """
+    Câmera com cache de blocos de pixels para mobjects periódicos.
+
+    Um mobject registrado com `cache_periodic_mobject` deixa de ser desenhado
+    pelo Cairo; a câmera copia o bloco `mobject.tile_index` pré-renderizado
+    na posição correspondente da imagem.
+
+    Com `track_dirty_regions = True`, cada quadro desenhado sobre o mesmo
+    fundo estático só restaura as regiões sujas do quadro anterior.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # id(mobject) -> (retângulo em pixels, lista de blocos pré-renderizados)
+        self.tile_cache = {}
+        self.track_dirty_regions = False
+        # Retângulos desenhados desde a última restauração do fundo; None
+        # indica que o conteúdo da imagem é desconhecido (cópia completa)
+        self.dirty_regions = None
+        self.dirty_background = None
+
+    def pixel_rect(self, points, pad=0):
+        """
+        Retângulo (x0, y0, x1, y1) em pixels inteiros que contém `points`
+        (coordenadas da cena), com `pad` pixels de folga, limitado à imagem.
+        """
+        points = np.asarray(points)
+        fc = self.frame_center
+        px = (points[:, 0] - fc[0]) * (self.pixel_width / self.frame_width) + self.pixel_width / 2
+        py = (fc[1] - points[:, 1]) * (self.pixel_height / self.frame_height) + self.pixel_height / 2
+        x0 = max(int(np.floor(px.min())) - pad, 0)
+        y0 = max(int(np.floor(py.min())) - pad, 0)
+        x1 = min(int(np.ceil(px.max())) + pad, self.pixel_width)
+        y1 = min(int(np.ceil(py.max())) + pad, self.pixel_height)
+        return x0, y0, x1, y1
+
+    def render_tile(self, mobjects, rect):
+        """
+        Rasteriza `mobjects` apenas dentro de `rect`, usando uma câmera
+        auxiliar alinhada à grade de pixels desta câmera.
+        """
+        return np.array(render_region(
+            mobjects, rect, self.frame_center, self.frame_width, self.frame_height,
+            self.pixel_width, self.pixel_height,
+            self.background_color, self.background_opacity,
+        ))
+
+    def cache_periodic_mobject(self, mobject, rect, tiles):
+        """
+        Registra os blocos `tiles` (um por estado) para `mobject`. O bloco a
+        ser usado em cada quadro é escolhido pelo atributo `tile_index`.
+        """
+        mobject.tile_index = 0
+        self.tile_cache[id(mobject)] = (rect, tiles)
+
+    def reset(self):
+        self.dirty_regions = None
+        self.dirty_background = None
+        return super().reset()
+
+    def set_frame_to_background(self, background):
+        if (
+            not self.track_dirty_regions
+            or self.dirty_regions is None
+            or background is not self.dirty_background
+            or background.shape != self.pixel_array.shape
+        ):
+            super().set_frame_to_background(background)
+            self.dirty_background = background
+        else:
+            regions = self.dirty_regions
+            if len(regions) > MAX_DIRTY_REGIONS:
+                regions = [(
+                    min(r[0] for r in regions),
+                    min(r[1] for r in regions),
+                    max(r[2] for r in regions),
+                    max(r[3] for r in regions),
+                )]
+            for x0, y0, x1, y1 in regions:
+                self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        self.dirty_regions = [] if self.track_dirty_regions else None
+
+    def mark_dirty(self, mobject):
+        """Registra a região da imagem que `mobject` pode ter pintado."""
+        points = mobject.points
+        if len(points) == 0:
+            return
+        if not isinstance(mobject, VMobject):
+            self.dirty_regions.append((0, 0, self.pixel_width, self.pixel_height))
+            return
+        stroke_width = max(
+            mobject.get_stroke_width(),
+            mobject.get_stroke_width(background=True),
+        )
+        # Meia espessura do traço em pixels, mais folga para o antisserrilhado
+        pad = int(np.ceil(
+            stroke_width * self.cairo_line_width_multiple
+            * self.pixel_width / self.frame_width / 2
+        )) + 2
+        self.dirty_regions.append(self.pixel_rect(points, pad=pad))
+
+    def display_vectorized(self, vmobject, ctx):
+        clip = getattr(vmobject, "reveal_clip", None)
+        if clip is None:
+            return super().display_vectorized(vmobject, ctx)
+        # Recorta tudo à direita de clip[0] (coordenadas da cena)
+        frame_left = self.frame_center[0] - self.frame_width / 2
+        frame_bottom = self.frame_center[1] - self.frame_height / 2
+        if clip[0] <= frame_left:
+            return self
+        ctx.save()
+        ctx.new_path()
+        ctx.rectangle(frame_left, frame_bottom, clip[0] - frame_left, self.frame_height)
+        ctx.clip()
+        super().display_vectorized(vmobject, ctx)
+        ctx.restore()
+        return self
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        if not self.tile_cache and self.dirty_regions is None:
+            return super().capture_mobjects(mobjects, **kwargs)
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        # Mantém a ordem de desenho: lotes vetoriais intercalados com as cópias
+        # dos blocos em cache
+        batch = []
+        for mobject in mobjects:
+            cached = self.tile_cache.get(id(mobject))
+            if cached is None:
+                batch.append(mobject)
+                if self.dirty_regions is not None:
+                    self.mark_dirty(mobject)
+                continue
+            if batch:
+                super().capture_mobjects(batch, include_submobjects=False)
+                batch = []
+            rect, tiles = cached
+            x0, y0, x1, y1 = rect
+            self.pixel_array[y0:y1, x0:x1] = tiles[mobject.tile_index]
+            if self.dirty_regions is not None:
+                self.dirty_regions.append(rect)
+        if batch:
+            super().capture_mobjects(batch, include_submobjects=False)
+
+
+class ClipReveal(Animation):
+    """
+    Revela `mobject` da esquerda para a direita movendo um retângulo de
+    recorte aplicado pela `FlashcardCamera`.
+
+    Diferente de `Create`, o `pointwise_become_partial` não é executado a
+    cada quadro: só muda a borda do recorte, compartilhada por todos os
+    sub-caminhos do mobject. Para gráficos amostrados em x uniforme (como
+    `axes.plot`) o avanço é o mesmo de `Create` com a mesma `rate_func`. A
+    borda do recorte é vertical, então a ponta da linha em movimento aparece
+    cortada reta.
+
+    `camera` é a câmera da cena, de onde vem a escala de traço do Cairo.
+    """
+    def __init__(self, mobject, camera, introducer=True, **kwargs):
+        self.camera = camera
+        super().__init__(mobject, introducer=introducer, **kwargs)
+
+    def begin(self):
+        # Folga de uma espessura de traço (na escala de traço do Cairo da
+        # câmera) para não cortar as pontas da linha
+        pad = self.mobject.get_stroke_width() * self.camera.cairo_line_width_multiple
+        self.x_start = self.mobject.get_left()[0] - pad
+        self.x_end = self.mobject.get_right()[0] + pad
+        self.clip = [self.x_start]
+        for mob in self.mobject.get_family():
+            mob.reveal_clip = self.clip
+        super().begin()
+
+    def create_starting_mobject(self):
+        # A interpolação não usa a cópia inicial; evita copiar todos os traços
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        # Sobrescreve o método que aplicaria a rate_func; aplicada aqui
+        self.clip[0] = self.x_start + self.rate_func(alpha) * (self.x_end - self.x_start)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        for mob in self.mobject.get_family():
+            mob.reveal_clip = None
@@ -0,0 +1,226 @@
+"""
+Servidor local de pré-visualização dos flashcards, com recarga automática.
+
+Mantém o Manim e o modelo do cartão (`bilhete_flashcard.py` e
+`waveforms.py`) carregados em memória e observa esses arquivos e o baralho
+(`deck.py`). Ao salvar uma alteração, o módulo é recarregado e só os cartões
+afetados são re-renderizados em qualidade de rascunho, direto para um PNG em
+memória:
+
+- mudança em `bilhete_flashcard.py` (estilos, layout) ou em `waveforms.py`
+  (frequências) afeta todos os cartões;
+- mudança em `deck.py` afeta só os cartões cujo código ou resposta mudou.
+
+Cartões que já estão abertos no navegador são re-renderizados na hora; os
+demais, quando forem pedidos. A página se atualiza sozinha.
+
+Uso (na raiz do repositório):
+
+    python preview_server.py --port 8000
+    # e abra http://localhost:8000
+"""
+
+import argparse
+import html
+import importlib
+import io
+import json
+import os
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bilhete_flashcard
+import deck
+import waveforms
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILES = [os.path.join(ROOT, "bilhete_flashcard.py"), os.path.join(ROOT, "waveforms.py")]
+DECK_FILE = os.path.join(ROOT, "deck.py")
+
+INDEX_TEMPLATE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Flashcards</title>
+<style>
+body {{ font-family: sans-serif; background: #eee; margin: 1em; }}
+figure {{ display: inline-block; margin: .5em; }}
+img {{ width: {width}px; background: white; box-shadow: 0 1px 3px #999; }}
+#erro {{ color: #b00; white-space: pre-wrap; }}
+</style></head>
+<body>
+<pre id="erro"></pre>
+{figures}
+<script>
+let versions = {{}};
+async function poll() {{
+  try {{
+    const state = await (await fetch("/state")).json();
+    document.getElementById("erro").textContent = state.error || "";
+    for (const [card, version] of Object.entries(state.versions)) {{
+      const img = document.getElementById("card-" + card);
+      if (img && versions[card] !== version) {{
+        versions[card] = version;
+        img.src = "/card/" + card + ".png?v=" + version;
+      }}
+    }}
+  }} catch (e) {{}}
+  setTimeout(poll, 250);
+}}
+poll();
+</script>
+</body></html>
+"""
+
+
+class PreviewState:
+    """
+    Cache dos PNGs em rascunho e recarga dos módulos. Todo acesso ao Manim
+    passa por `self.lock`, já que a configuração do Manim é global.
+    """
+    def __init__(self, pixel_width):
+        self.pixel_width = pixel_width
+        self.pixel_height = round(pixel_width * 9 / 16)
+        self.lock = threading.RLock()
+        self.images = {}     # número -> PNG (bytes)
+        self.versions = {}   # número -> contador, muda a cada nova imagem
+        self.error = None
+
+    def render(self, number):
+        with self.lock:
+            image = bilhete_flashcard.render_flashcard(
+                number, pixel_width=self.pixel_width, pixel_height=self.pixel_height
+            )
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            self.images[number] = buffer.getvalue()
+            self.versions[number] = self.versions.get(number, 0) + 1
+            return self.images[number]
+
+    def get_png(self, number):
+        with self.lock:
+            if number in self.images:
+                return self.images[number]
+            return self.render(number)
+
+    def reload(self, source_changed, deck_changed):
+        """Recarrega os módulos alterados e re-renderiza os cartões afetados."""
+        with self.lock:
+            old_deck = dict(deck.FLASHCARDS)
+            try:
+                if source_changed:
+                    importlib.reload(waveforms)
+                if deck_changed:
+                    importlib.reload(deck)
+                # bilhete_flashcard guarda referências aos módulos antigos
+                importlib.reload(bilhete_flashcard)
+            except Exception:
+                self.error = traceback.format_exc()
+                return
+            if source_changed:
+                affected = set(self.images)
+            else:
+                affected = {n for n in self.images if deck.FLASHCARDS.get(n) != old_deck.get(n)}
+            self.error = None
+            for number in sorted(affected):
+                del self.images[number]
+                if number not in deck.FLASHCARDS:
+                    continue
+                try:
+                    self.render(number)
+                except Exception:
+                    self.error = traceback.format_exc()
+
+
+def watch(state, interval):
+    """Observa os arquivos do modelo e do baralho e recarrega ao mudarem."""
+    mtimes = {path: os.path.getmtime(path) for path in (*SOURCE_FILES, DECK_FILE)}
+    while True:
+        time.sleep(interval)
+        changed = set()
+        for path in mtimes:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue  # Arquivo sendo salvo pelo editor
+            if mtime != mtimes[path]:
+                mtimes[path] = mtime
+                changed.add(path)
+        if changed:
+            started = time.perf_counter()
+            state.reload(bool(changed & set(SOURCE_FILES)), DECK_FILE in changed)
+            print(f"Recarregado em {time.perf_counter() - started:.2f}s")
+
+
+def make_handler(state):
+    class PreviewHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/":
+                figures = "\n".join(
+                    f'<figure><img id="card-{n}" alt="{n}">'
+                    f'<figcaption>{n} — {html.escape(data["answer"])}</figcaption></figure>'
+                    for n, data in sorted(deck.FLASHCARDS.items())
+                )
+                page = INDEX_TEMPLATE.format(width=state.pixel_width // 2, figures=figures)
+                self.send(200, "text/html; charset=utf-8", page.encode())
+            elif path == "/state":
+                with state.lock:
+                    # Cartões ainda não renderizados recebem versão 0 para
+                    # que a página os peça
+                    versions = {n: state.versions.get(n, 0) for n in deck.FLASHCARDS}
+                    body = json.dumps({"versions": versions, "error": state.error})
+                self.send(200, "application/json", body.encode())
+            elif path.startswith("/card/") and path.endswith(".png"):
+                try:
+                    number = int(path[len("/card/"):-len(".png")])
+                except ValueError:
+                    number = None
+                if number not in deck.FLASHCARDS:
+                    self.send(404, "text/plain", b"cartao nao encontrado")
+                    return
+                try:
+                    png = state.get_png(number)
+                except Exception:
+                    with state.lock:
+                        state.error = traceback.format_exc()
+                    self.send(500, "text/plain", state.error.encode())
+                    return
+                self.send(200, "image/png", png)
+            else:
+                self.send(404, "text/plain", b"nao encontrado")
+
+        def send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Sem log a cada pedido de /state
+
+    return PreviewHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--width", type=int, default=640,
+                        help="largura em pixels da pré-visualização (padrão: 640)")
+    parser.add_argument("--interval", type=float, default=0.2,
+                        help="intervalo em segundos entre verificações dos arquivos")
+    args = parser.parse_args()
+
+    state = PreviewState(args.width)
+    threading.Thread(target=watch, args=(state, args.interval), daemon=True).start()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"Pré-visualização em http://localhost:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Renderiza o baralho e monta o PDF de impressão em um único passo.
+
+Os cartões são renderizados em memória por processos trabalhadores e entregues
+ao montador do PDF na ordem do baralho; cada página 2x2 é desenhada assim que
+seus quatro cartões ficam prontos, enquanto os seguintes ainda estão sendo
+renderizados. Nenhum PNG intermediário é gravado nem relido do disco.
+
+No máximo `--max-pending` cartões ficam em voo (pedidos aos trabalhadores e
+ainda não consumidos pelo PDF), o que limita as renderizações pendentes. O
+canvas do ReportLab ainda guarda todas as páginas prontas até o `save()`,
+então a memória do PDF cresce com o tamanho do baralho.
+
+Com `--shard-index`/`--shard-count`, o baralho é dividido entre várias
+máquinas (ou processos): cada shard renderiza só os seus cartões em arquivos
+dentro de `--out-dir` (PNG para `--scene layout`, mp4 para `--scene
+animation`) e grava um manifesto com o arquivo e o hash de cada cartão. O
+`combine_cards_to_pdf.py --manifests` confere os manifestos de todos os shards
+antes de montar o PDF.
+
+Uso (na raiz do repositório):
+
+    python render_deck.py --workers 4
+    python render_deck.py --cards 1 2 3 4 --output teste.pdf
+
+    # Três shards como processos separados na mesma máquina
+    for i in 0 1 2; do
+      python render_deck.py --shard-index $i --shard-count 3 --out-dir build &
+    done; wait
+    python combine_cards_to_pdf.py --manifests build/manifest_*_of_3.json
+"""
+
+import argparse
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from combine_cards_to_pdf import OUTPUT_PDF, write_pdf
+from deck import FLASHCARDS
+from deck_shards import cards_for_shard, manifest_path, write_manifest
+
+
+def render_card(number):
+    """Renderiza um cartão (executado nos processos trabalhadores)."""
+    # Importado aqui para que só os trabalhadores carreguem o Manim
+    from bilhete_flashcard import render_flashcard
+    return render_flashcard(number).convert("RGB")
+
+
+def render_card_file(scene, number, out_dir):
+    """
+    Renderiza um cartão em arquivo dentro de `out_dir` (executado nos
+    processos trabalhadores) e devolve o caminho.
+    """
+    if scene == "animation":
+        from bilhete_flashcard_1_animation import render_flashcard_animation
+        return render_flashcard_animation(
+            number, os.path.join(out_dir, f"bilhete_flashcard_{number}_animation.mp4")
+        )
+    path = os.path.join(out_dir, f"bilhete_flashcard_{number}.png")
+    render_card(number).save(path)
+    return path
+
+
+def iter_ordered_results(func, args_list, workers, max_pending):
+    """
+    Aplica `func` a cada tupla de `args_list` nos trabalhadores e gera os
+    resultados na mesma ordem. Novas tarefas só são pedidas quando há menos
+    de `max_pending` em voo.
+    """
+    with Pool(workers) as pool:
+        pending = deque()
+        for args in args_list:
+            pending.append(pool.apply_async(func, args))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def iter_rendered_cards(numbers, workers, max_pending):
+    """
+    Gera as imagens dos cartões `numbers`, na mesma ordem, à medida que os
+    trabalhadores terminam.
+    """
+    return iter_ordered_results(render_card, [(n,) for n in numbers], workers, max_pending)
+
+
+def render_shard(scene, shard_index, shard_count, out_dir, workers, max_pending):
+    """
+    Renderiza os cartões do shard em `out_dir` e grava o manifesto do shard.
+    Devolve o caminho do manifesto.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    numbers = cards_for_shard(shard_index, shard_count)
+    files = iter_ordered_results(
+        render_card_file, [(scene, n, out_dir) for n in numbers], workers, max_pending
+    )
+    entries = dict(zip(numbers, files))
+    path = manifest_path(out_dir, shard_index, shard_count)
+    write_manifest(path, scene, shard_index, shard_count, entries)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=None,
+                        help="números dos cartões, na ordem do PDF (padrão: todo o baralho)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processos de renderização (padrão: número de CPUs)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="cartões em voo no máximo (padrão: 2 x workers)")
+    parser.add_argument("--output", default=OUTPUT_PDF, help="arquivo PDF de saída")
+    parser.add_argument("--scene", choices=["layout", "animation"], default="layout",
+                        help="cena renderizada nos shards (padrão: layout)")
+    parser.add_argument("--shard-index", type=int, default=None, help="shard desta execução (0 a N-1)")
+    parser.add_argument("--shard-count", type=int, default=None, help="número total de shards (N)")
+    parser.add_argument("--out-dir", default="build", help="pasta dos arquivos e do manifesto do shard")
+    args = parser.parse_args()
+    max_pending = args.max_pending or 2 * args.workers
+
+    if (args.shard_index is None) != (args.shard_count is None):
+        parser.error("--shard-index e --shard-count devem ser usados juntos")
+    if args.shard_count is not None:
+        if args.cards is not None:
+            parser.error("--cards não pode ser usado com shards (o shard define os cartões)")
+        if not 0 <= args.shard_index < args.shard_count:
+            parser.error("--shard-index deve estar entre 0 e --shard-count - 1")
+        path = render_shard(args.scene, args.shard_index, args.shard_count,
+                            args.out_dir, args.workers, max_pending)
+        print(f"Manifesto gerado: {path}")
+        return
+    if args.scene != "layout":
+        parser.error("o PDF só pode ser montado com --scene layout; use shards para a animação")
+
+    numbers = args.cards or sorted(FLASHCARDS)
+    unknown = [n for n in numbers if n not in FLASHCARDS]
+    if unknown:
+        parser.error(f"cartões fora do baralho: {unknown}")
+    cards = iter_rendered_cards(numbers, args.workers, max_pending)
+    count = write_pdf(cards, args.output)
+    print(f"PDF gerado: {args.output} ({count} cartões)")
+
+
+if __name__ == "__main__":
+    main()
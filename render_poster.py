@@ -0,0 +1,136 @@
+"""
+Renderiza um flashcard em alta resolução (pôster) por blocos, com memória
+limitada.
+
+A cena 16x9 do `FlashcardLayout` é rasterizada em blocos de `--tile` pixels;
+cada faixa de blocos é montada direto no buffer de linhas do PNG, comprimida
+e gravada assim que termina, então a memória de pico é uma faixa (`--tile`
+x largura da imagem x 3 bytes) mais um bloco, nunca a imagem inteira. O PNG
+sai com a resolução (DPI) gravada no arquivo.
+
+Uso (na raiz do repositório):
+
+    python render_poster.py --card 5 --dpi 300 --width-cm 84.1
+"""
+
+import argparse
+import struct
+import zlib
+
+import numpy as np
+from manim import tempconfig
+
+from bilhete_flashcard import build_flashcard_scene
+from deck import FLASHCARDS
+from flashcard_camera import render_region
+
+
+def _png_chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def png_rows(n_rows, width):
+    """
+    Aloca um buffer de `n_rows` linhas de um PNG RGB, já com o byte de filtro
+    (0 = nenhum) no início de cada linha. Devolve (buffer, pixels), onde
+    `pixels` é a vista (n_rows, width, 3) a ser preenchida.
+    """
+    rows = np.empty((n_rows, 1 + width * 3), dtype=np.uint8)
+    rows[:, 0] = 0
+    return rows, rows[:, 1:].reshape(n_rows, width, 3)
+
+
+def write_png_rows(path, width, height, chunks, dpi):
+    """
+    Grava um PNG RGB de `width` x `height` a partir de `chunks`, um iterável
+    de buffers de linhas no formato de `png_rows` (de cima para baixo),
+    comprimindo cada um conforme chega. O buffer pode ser reaproveitado pelo
+    gerador depois de consumido.
+    """
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        pixels_per_meter = round(dpi / 0.0254)
+        _png_chunk(f, b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+        compressor = zlib.compressobj(6)
+        for rows in chunks:
+            data = compressor.compress(memoryview(rows))
+            if data:
+                _png_chunk(f, b"IDAT", data)
+        _png_chunk(f, b"IDAT", compressor.flush())
+        _png_chunk(f, b"IEND", b"")
+
+
+def write_png_bands(path, width, height, bands, dpi):
+    """
+    Como `write_png_rows`, mas a partir de arrays uint8 (linhas, width, 3)
+    de pixels, copiados para um buffer de linhas reaproveitado.
+    """
+    def iter_rows():
+        rows = pixels = None
+        for band in bands:
+            if rows is None or len(rows) < len(band):
+                rows, pixels = png_rows(len(band), width)
+            pixels[:len(band)] = band
+            yield rows[:len(band)]
+
+    write_png_rows(path, width, height, iter_rows(), dpi)
+
+
+def iter_tile_bands(scene, pixel_width, pixel_height, tile):
+    """
+    Gera as faixas horizontais da imagem no formato de `png_rows`, cada uma
+    montada bloco a bloco direto no mesmo buffer.
+    """
+    camera = scene.renderer.camera
+    rows, pixels = png_rows(min(tile, pixel_height), pixel_width)
+    for y0 in range(0, pixel_height, tile):
+        y1 = min(y0 + tile, pixel_height)
+        for x0 in range(0, pixel_width, tile):
+            x1 = min(x0 + tile, pixel_width)
+            tile_pixels = render_region(
+                scene.mobjects, (x0, y0, x1, y1),
+                camera.frame_center, camera.frame_width, camera.frame_height,
+                pixel_width, pixel_height,
+                camera.background_color, camera.background_opacity,
+            )
+            pixels[:y1 - y0, x0:x1] = tile_pixels[:, :, :3]
+        yield rows[:y1 - y0]
+
+
+def render_poster(number, output, dpi, width_cm, tile):
+    """Renderiza o flashcard `number` em `output` (PNG) na largura e DPI pedidos."""
+    with tempconfig({"dry_run": True}):
+        scene = build_flashcard_scene(number)
+        pixel_width = round(width_cm / 2.54 * dpi)
+        pixel_height = round(pixel_width * scene.renderer.camera.frame_height / scene.renderer.camera.frame_width)
+        bands = iter_tile_bands(scene, pixel_width, pixel_height, tile)
+        write_png_rows(output, pixel_width, pixel_height, bands, dpi)
+    return pixel_width, pixel_height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--card", type=int, required=True, help="número do flashcard")
+    parser.add_argument("--dpi", type=int, default=300, help="resolução de impressão (padrão: 300)")
+    parser.add_argument("--width-cm", type=float, default=84.1,
+                        help="largura impressa em cm (padrão: 84.1, A1 paisagem)")
+    parser.add_argument("--tile", type=int, default=1024,
+                        help="lado do bloco em pixels (padrão: 1024); a memória de pico cresce "
+                             "com --tile x largura da imagem (uma faixa de blocos)")
+    parser.add_argument("--output", default=None,
+                        help="arquivo PNG de saída (padrão: bilhete_flashcard_<n>_<dpi>dpi.png)")
+    args = parser.parse_args()
+    if args.card not in FLASHCARDS:
+        parser.error(f"cartão fora do baralho: {args.card}")
+
+    output = args.output or f"bilhete_flashcard_{args.card}_{args.dpi}dpi.png"
+    width, height = render_poster(args.card, output, args.dpi, args.width_cm, args.tile)
+    print(f"Pôster gerado: {output} ({width}x{height} px, {args.dpi} dpi)")
+
+
+if __name__ == "__main__":
+    main()
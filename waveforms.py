@@ -0,0 +1,134 @@
+"""
+Cálculo da onda FM dos flashcards, sem depender do Manim.
+
+A onda de um cartão tem seis segmentos; o segmento i usa a frequência base
+do tipo de onda `code[i]`, com uma transição suave (sigmoide) nos últimos 5%
+de cada segmento. A fase é a integral da frequência (regra do trapézio em
+passos de 0.01), calculada uma única vez por código numa tabela, então
+avaliar a onda em qualquer x custa uma consulta à tabela.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Frequências base para cada tipo de onda (em Hz)
+# Organizadas por frequência decrescente para melhor visualização
+BASE_FREQS = {
+    1: 8.0,   # Frequência mais alta
+    2: 6.0,
+    3: 4.6,
+    4: 4.0,
+    5: 3.0,
+    6: 2.5    # Frequência mais baixa
+}
+
+N_SEGMENTS = 6
+# Passo da integração da fase e da amostragem dos gráficos
+STEP = 0.01
+# Fração final de cada segmento usada na transição para a próxima frequência
+TRANSITION_WIDTH = 0.05
+
+
+def frequencies_for(code):
+    """Frequências dos seis segmentos de um cartão."""
+    return [BASE_FREQS[d] for d in code]
+
+
+def frequency_at_x(x, frequencies):
+    """
+    Frequência instantânea em x (escalar ou array). `frequencies` pode ser
+    uma lista de seis frequências ou um array (cartões, 6), e nesse caso o
+    resultado tem uma linha por cartão.
+    """
+    x = np.asarray(x, dtype=float)
+    frequencies = np.asarray(frequencies, dtype=float)
+    segment = np.trunc(x).astype(int)
+    current = np.take(frequencies, np.clip(segment, 0, N_SEGMENTS - 1), axis=-1)
+    following = np.take(frequencies, np.clip(segment + 1, 0, N_SEGMENTS - 1), axis=-1)
+    in_transition = (segment >= 0) & (segment < N_SEGMENTS - 1) & (x % 1 > 1 - TRANSITION_WIDTH)
+    # Transição suave (sigmoide) centrada a meia largura do fim do segmento
+    transition_point = segment + 1 - TRANSITION_WIDTH / 2
+    with np.errstate(over="ignore"):
+        sigmoid = 1 / (1 + np.exp(-(x - transition_point) / TRANSITION_WIDTH))
+    smooth = current * (1 - sigmoid) + following * sigmoid
+    return np.where(in_transition, smooth, current)
+
+
+def phase_table(frequencies, x_max=N_SEGMENTS):
+    """
+    Fase acumulada em cada ponto da grade k * STEP, de 0 até passar de
+    `x_max`, integrando a frequência pela regra do trapézio. Com um array
+    (cartões, 6) de frequências, devolve uma tabela por cartão.
+    """
+    n_points = int(np.ceil((x_max + STEP) / STEP)) + 1
+    points = np.arange(n_points) * STEP
+    f = frequency_at_x(points, frequencies) * np.pi
+    increments = (f[..., :-1] + f[..., 1:]) / 2 * np.diff(points)
+    start = np.zeros(f.shape[:-1] + (1,))
+    return np.concatenate([start, np.cumsum(increments, axis=-1)], axis=-1)
+
+
+def phase_index(x, table_length):
+    """
+    Índice na tabela de fase do último ponto da grade em [0, x + STEP),
+    limitado à tabela: x < 0 usa a fase 0 (onda nula, como na integração
+    original) e x além do fim da tabela usa a última fase calculada.
+    """
+    index = np.ceil((np.asarray(x, dtype=float) + STEP) / STEP).astype(int) - 1
+    return np.clip(index, 0, table_length - 1)
+
+
+@lru_cache(maxsize=4096)
+def _phase_table_for_code(code):
+    return phase_table(frequencies_for(code))
+
+
+def fm_wave_function(code):
+    """Devolve fm_wave(x) (escalar ou array) para o código de um cartão."""
+    phase = _phase_table_for_code(tuple(code))
+
+    def fm_wave(x):
+        return np.sin(phase[phase_index(x, len(phase))])
+
+    return fm_wave
+
+
+def segment_x(i):
+    """Abscissas amostradas no segmento i, como em `axes.plot` (passo STEP)."""
+    return np.append(np.arange(i, i + 1, STEP), i + 1)
+
+
+@lru_cache(maxsize=4096)
+def _segment_samples(code):
+    fm_wave = fm_wave_function(code)
+    return [(x, fm_wave(x)) for x in (segment_x(i) for i in range(N_SEGMENTS))]
+
+
+def segment_samples(code):
+    """Lista com (x, y) de cada um dos seis segmentos da onda do cartão."""
+    return _segment_samples(tuple(code))
+
+
+def sample_layout():
+    """
+    Abscissas e índice do segmento de todas as amostras de um cartão, com
+    os seis segmentos concatenados (as mesmas para todos os cartões).
+    """
+    xs = [segment_x(i) for i in range(N_SEGMENTS)]
+    segments = [np.full(len(x), i, dtype=np.int8) for i, x in enumerate(xs)]
+    return np.concatenate(xs), np.concatenate(segments)
+
+
+def batch_segment_samples(codes):
+    """
+    Valores da onda de vários cartões de uma vez: `codes` é um array
+    (cartões, 6) de tipos de onda; devolve um array (cartões, amostras)
+    alinhado com `sample_layout()`.
+    """
+    freq_lookup = np.zeros(max(BASE_FREQS) + 1)
+    for wave_type, freq in BASE_FREQS.items():
+        freq_lookup[wave_type] = freq
+    phase = phase_table(freq_lookup[np.asarray(codes)])
+    x, _ = sample_layout()
+    return np.sin(phase[:, phase_index(x, phase.shape[-1])])